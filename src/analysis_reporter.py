@@ -46,15 +46,15 @@ def generate_analysis_report(processed_dir):
     
     # Categories Analysis
     print(f"\n🏷️ ENTITY CATEGORIZATION:")
-    total_entities = sum(len(entities) for entities in categories.values() if entities)
+    total_entities = sum(len(entities['names']) for entities in categories.values() if entities)
     print(f"   📊 Total Categorized Entities: {total_entities}")
     
     for category, entities in categories.items():
-        if entities:
+        if entities and entities['names']:
             category_name = category.replace('_', ' ').title()
-            print(f"\n   📁 {category_name} ({len(entities)} entities):")
-            for entity in entities:
-                print(f"      • {entity['name']} ({entity['type']})")
+            print(f"\n   📁 {category_name} ({len(entities['names'])} entities):")
+            for name, entity_type in zip(entities['names'], entities['types']):
+                print(f"      • {name} ({entity_type})")
     
     # Relationships Analysis
     print(f"\n🔗 RELATIONSHIP ANALYSIS:")
@@ -110,12 +110,9 @@ class BatchGeodataAnalyzer:
             entity_stats[filename] = {}
             
             for category, entities in categories.items():
-                count = len(entities) if entities else 0
-                entity_stats[filename][category] = count
-                
-                if entities:
-                    for entity in entities:
-                        all_entities.add(entity['name'])
+                names = entities['names'] if entities else []
+                entity_stats[filename][category] = len(names)
+                all_entities.update(names)
         
         return {
             'entity_counts_by_document': entity_stats,
@@ -136,8 +133,7 @@ class BatchGeodataAnalyzer:
             
             for category, entities in categories.items():
                 if entities:
-                    for entity in entities:
-                        document_entities.add(entity['name'])
+                    document_entities.update(entities['names'])
             
             for entity in document_entities:
                 entity_frequency[entity] = entity_frequency.get(entity, 0) + 1
@@ -157,7 +153,7 @@ class BatchGeodataAnalyzer:
             categories = result['results']['categorized_entities']
             
             for category, entities in categories.items():
-                count = len(entities) if entities else 0
+                count = len(entities['names']) if entities else 0
                 category_totals[category] = category_totals.get(category, 0) + count
         
         return category_totals
@@ -215,7 +211,7 @@ class BatchGeodataAnalyzer:
             
             categories = result['results']['categorized_entities']
             if 'geographic_locations' in categories:
-                locations = [entity['name'] for entity in categories['geographic_locations']]
+                locations = list(categories['geographic_locations']['names'])
             
             geographic_data[filename] = locations
         
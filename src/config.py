@@ -1,11 +1,31 @@
-import yaml
+import copy
+import os
+from functools import lru_cache
 from pathlib import Path
 
-def load_config():
-    """Loads the configuration from config.yml."""
-    config_path = Path(__file__).parent.parent / "config.yml"
+import yaml
+
+CONFIG_PATH = Path(__file__).parent.parent / "config.yml"
+
+def _load_config_raw(config_path: Path) -> dict:
+    """Reads and parses the YAML configuration file from disk."""
     with open(config_path, "r") as f:
-        config = yaml.safe_load(f)
-    return config
+        return yaml.safe_load(f)
+
+@lru_cache(maxsize=4)
+def _load_config_cached(config_path: str, mtime_ns: int) -> dict:
+    """Caches parsed configs keyed on path and modification time."""
+    return _load_config_raw(Path(config_path))
+
+def load_config():
+    """Loads the configuration from config.yml.
+
+    The parsed result is cached and only re-read from disk when the
+    file's modification time changes, so repeated calls skip the YAML
+    parse. Each caller receives its own deep copy, so in-place mutation
+    of the returned dict stays local instead of poisoning the cache.
+    """
+    mtime_ns = os.stat(CONFIG_PATH).st_mtime_ns
+    return copy.deepcopy(_load_config_cached(str(CONFIG_PATH), mtime_ns))
 
 config = load_config()
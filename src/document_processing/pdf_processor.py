@@ -25,25 +25,35 @@ def extract_full_text_from_pdf(pdf_path: pathlib.Path) -> str:
         logging.error(f"Could not extract text from PDF '{pdf_path.name}'. Error: {e}")
         return ""
 
-def chunk_text_by_paragraph(text: str, min_chunk_size: int = 50) -> List[str]:
+def chunk_text_by_paragraph(text: str, min_chunk_size: int = 50, with_offsets: bool = False):
     """
     Splits text into semantic chunks based on paragraphs (double newlines)
     and filters out very small, likely irrelevant chunks.
+
+    With with_offsets=True, returns (chunks, offsets) where offsets holds
+    each kept chunk's (start, end) position in the original text, letting
+    callers slice the original instead of re-joining cleaned chunks.
     """
     if not text:
-        return []
-    
-    # Split by double newline, which typically separates paragraphs
-    chunks = text.split('\n\n')
-    
-    # Clean up chunks and filter out small or empty ones
-    processed_chunks = [
-        chunk.strip().replace('\n', ' ') 
-        for chunk in chunks 
-        if len(chunk.strip()) > min_chunk_size
-    ]
-    
+        return ([], []) if with_offsets else []
+
+    processed_chunks = []
+    offsets = []
+    start = 0
+
+    # Split by double newline, which typically separates paragraphs,
+    # tracking each paragraph's position in the original text
+    for chunk in text.split('\n\n'):
+        end = start + len(chunk)
+        stripped = chunk.strip()
+        if len(stripped) > min_chunk_size:
+            processed_chunks.append(stripped.replace('\n', ' '))
+            offsets.append((start, end))
+        start = end + 2
+
     logging.info(f"Split text into {len(processed_chunks)} semantic chunks.")
+    if with_offsets:
+        return processed_chunks, offsets
     return processed_chunks
 
 def extract_images_from_pdf(pdf_path: pathlib.Path, output_dir: pathlib.Path) -> list:
@@ -5,6 +5,7 @@ import json
 import logging
 import time
 import hashlib
+from functools import lru_cache
 from typing import Type, TypeVar, Optional, List
 
 from pydantic import ValidationError, BaseModel
@@ -57,9 +58,14 @@ def generate_cache_key(prompt: str, input_data: list) -> str:
 
 
 # --- Configuration ---
+@lru_cache(maxsize=8)
 def configure_agent(agent_type: str, agent_name: str, api_key: str):
     """
     Configures and returns an agent manager.
+
+    Memoized on (agent_type, agent_name, api_key) so repeated diagnostic
+    or pipeline calls reuse the already-initialized SDK client instead of
+    rebuilding it. Call configure_agent.cache_clear() after key rotation.
     """
     return AgentManager(agent_name=agent_name, agent_type=agent_type, api_key=api_key)
 
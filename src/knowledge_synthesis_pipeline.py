@@ -3,6 +3,7 @@
 协调三阶段的智能地质数据提取和知识合成流程
 """
 
+import dataclasses
 import json
 import logging
 from typing import Dict, List, Optional, Any
@@ -403,6 +404,10 @@ class KnowledgeSynthesisPipeline:
         """JSON序列化器"""
         if hasattr(obj, 'model_dump'):
             return obj.model_dump()
+        # slots=True的dataclass(如GeospatialData)没有__dict__，
+        # 用asdict展开成嵌套字典
+        elif dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+            return dataclasses.asdict(obj)
         elif hasattr(obj, '__dict__'):
             return obj.__dict__
         else:
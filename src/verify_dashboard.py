@@ -1,43 +1,73 @@
+import json
 import webbrowser
 from pathlib import Path
-import time
 
 def verify_dashboard():
     """验证仪表板是否正确生成并打开"""
-    
+
     dashboard_path = Path("data/processed/2008_MATABANE_FE3_dashboard.html")
-    
+    analysis_path = Path("data/processed/2008_MATABANE_FE3_complete_analysis.json")
+
     if not dashboard_path.exists():
         print("❌ Dashboard file not found!")
         return False
-    
+
     print(f"✅ Dashboard file found: {dashboard_path}")
     print(f"📏 File size: {dashboard_path.stat().st_size} bytes")
-    
-    # Check if file contains data
+
+    if not analysis_path.exists():
+        print("❌ Analysis JSON sidecar not found!")
+        return False
+
+    print(f"✅ Analysis sidecar found: {analysis_path}")
+
+    # Check the dashboard wiring: it fetches the sidecar JSON and falls
+    # back to the embedded copy when opened via file://
     with open(dashboard_path, 'r', encoding='utf-8') as f:
         content = f.read()
-    
-    # Verify key data elements
-    checks = [
-        ('"total_entities": 14', "实体总数"),
-        ('"total_relationships": 15', "关系总数"), 
+
+    html_checks = [
+        ("_complete_analysis.json';", "数据文件引用"),
+        ('fetch(DATA_URL)', "数据加载逻辑"),
+        ('id="analysis-data"', "内嵌数据回退"),
         ('Geological Formations', "地质构造分类"),
-        ('Sadiola goldfield', "地理位置数据"),
-        ('Gold', "矿物数据"),
-        ('ANALYSIS_DATA', "数据嵌入")
     ]
-    
-    print("\n🔍 Data verification:")
+
+    print("\n🔍 Dashboard verification:")
     all_passed = True
-    
-    for check_text, description in checks:
+
+    for check_text, description in html_checks:
         if check_text in content:
             print(f"  ✅ {description}: 找到")
         else:
             print(f"  ❌ {description}: 未找到")
             all_passed = False
-    
+
+    # Verify key data elements in the sidecar JSON
+    with open(analysis_path, 'r', encoding='utf-8') as f:
+        analysis = json.load(f)
+
+    summary = analysis.get('insights', {}).get('summary', {})
+    categories = analysis.get('categorized_entities', {})
+    location_names = categories.get('geographic_locations', {}).get('names', [])
+    mineral_names = categories.get('minerals_and_rocks', {}).get('names', [])
+
+    data_checks = [
+        (summary.get('total_entities', 0) > 0, "实体总数"),
+        (summary.get('total_relationships', 0) > 0, "关系总数"),
+        ('Sadiola goldfield' in location_names, "地理位置数据"),
+        ('Gold' in mineral_names, "矿物数据"),
+    ]
+
+    print("\n🔍 Data verification:")
+
+    for passed, description in data_checks:
+        if passed:
+            print(f"  ✅ {description}: 找到")
+        else:
+            print(f"  ❌ {description}: 未找到")
+            all_passed = False
+
     if all_passed:
         print("\n🎉 所有数据验证通过！")
         print(f"🌐 打开仪表板: file://{dashboard_path.absolute()}")
@@ -0,0 +1,103 @@
+import pathlib
+import sys
+import unittest
+
+# Add the 'src' directory to the Python path to allow for absolute imports
+project_root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from enhanced_analyzer import _REL_BUCKET, _render_dashboard, _resolve_category
+
+
+def _reference_ladder(entity_name, entity_type):
+    """The original if/elif categorization ladder, kept as the behavioral
+    reference for the dispatch-table implementation."""
+    if entity_type in ('LOCATION', 'PLACE', 'GEOGRAPHIC'):
+        return 'geographic_locations'
+    if entity_type in ('MINERAL', 'ROCK', 'LITHOLOGY') or any(
+            k in entity_name for k in ('gold', 'arsenopyrite', 'pyrite', 'quartz', 'granite', 'basalt')):
+        return 'minerals_and_rocks'
+    if entity_type in ('FORMATION', 'UNIT', 'GROUP', 'MEMBER', 'GEOLOGICAL_FORMATION') or any(
+            k in entity_name for k in ('facies', 'unit', 'formation', 'profile', 'pluton', 'complex')):
+        return 'geological_formations'
+    if entity_type in ('PROCESS', 'EVENT') or any(
+            k in entity_name for k in ('weathering', 'erosion', 'deformation', 'metamorphism')):
+        return 'geological_processes'
+    if entity_type in ('AGE', 'TIME', 'PERIOD', 'ERA') or any(
+            k in entity_name for k in ('ma', 'mya', 'age', 'period', 'era')):
+        return 'temporal_data'
+    if entity_type in ('METHOD', 'TECHNIQUE', 'ANALYSIS') or any(
+            k in entity_name for k in ('analysis', 'xrd', 'sem', 'assay', 'drilling')):
+        return 'analytical_methods'
+    if entity_type in ('DEPOSIT', 'ORE', 'GOLD', 'COPPER', 'ZINC') or any(
+            k in entity_name for k in ('deposit', 'ore', 'mining', 'exploration', 'resource')):
+        return 'economic_geology'
+    if entity_type in ('FAULT', 'FOLD', 'SHEAR', 'STRUCTURE', 'GEOLOGICAL_STRUCTURE') or any(
+            k in entity_name for k in ('fault', 'fold', 'shear', 'dyke', 'dike', 'vein',
+                                       'fracture', 'joint', 'channel')):
+        return 'structural_features'
+    if 'gold' in entity_name or 'ore' in entity_name:
+        return 'economic_geology'
+    return 'geological_formations'
+
+
+class TestResolveCategory(unittest.TestCase):
+
+    TYPES = ['LOCATION', 'MINERAL', 'ROCK', 'FORMATION', 'UNIT', 'PROCESS',
+             'AGE', 'METHOD', 'DEPOSIT', 'ORE', 'FAULT', 'STRUCTURE', 'THING', '']
+    NAMES = ['sadiola', 'gold vein', 'quartz', 'birimian formation', 'weathering profile',
+             'intense deformation', 'eburnean period', '2100 ma', 'xrd analysis',
+             'ore body', 'main fault', 'dike swarm', 'shear zone', 'drill core assay',
+             'plain entity', 'gold ore deposit', 'granite pluton', 'exploration target']
+
+    def test_matches_reference_ladder(self):
+        """The table-driven resolution must agree with the original ladder
+        for every (type, name) combination, keyword overlaps included."""
+        for entity_type in self.TYPES:
+            for entity_name in self.NAMES:
+                with self.subTest(type=entity_type, name=entity_name):
+                    self.assertEqual(
+                        _resolve_category(entity_name, entity_type),
+                        _reference_ladder(entity_name, entity_type),
+                    )
+
+    def test_spot_checks(self):
+        self.assertEqual(_resolve_category('bern', 'LOCATION'), 'geographic_locations')
+        self.assertEqual(_resolve_category('arsenopyrite', 'THING'), 'minerals_and_rocks')
+        # mineral keyword outranks the structural type, as in the old ladder
+        self.assertEqual(_resolve_category('quartz vein', 'FAULT'), 'minerals_and_rocks')
+        # catch-all default
+        self.assertEqual(_resolve_category('plain entity', 'THING'), 'geological_formations')
+
+
+class TestRelBucket(unittest.TestCase):
+
+    BUCKETS = {'spatial_relationships', 'temporal_relationships',
+               'compositional_relationships', 'genetic_relationships'}
+
+    def test_every_entry_maps_to_a_known_bucket(self):
+        for rel_type, (bucket, kind) in _REL_BUCKET.items():
+            self.assertIn(bucket, self.BUCKETS, rel_type)
+            self.assertIsInstance(kind, str)
+
+    def test_spot_checks(self):
+        self.assertEqual(_REL_BUCKET['LOCATED_IN'], ('spatial_relationships', 'spatial'))
+        self.assertIsNone(_REL_BUCKET.get('UNKNOWN_TYPE'))
+
+
+class TestRenderDashboard(unittest.TestCase):
+
+    def test_substitutes_placeholders_and_keeps_js_intact(self):
+        html = _render_dashboard('doc.pdf', 'doc')
+        self.assertIn('doc.pdf', html)
+        self.assertIn("const DATA_URL = 'doc_complete_analysis.json';", html)
+        # the per-call data slot survives the cached substitution
+        self.assertIn('$data_json', html)
+        # JS template-literal interpolations must pass through untouched
+        self.assertIn('${stat.color}', html)
+        self.assertNotIn('${filename}', html)
+        self.assertNotIn('{{', html)
+
+
+if __name__ == '__main__':
+    unittest.main()
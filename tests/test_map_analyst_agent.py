@@ -0,0 +1,76 @@
+import pathlib
+import sys
+import unittest
+
+# Add the 'src' directory to the Python path to allow for absolute imports
+project_root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from agents.map_analyst_agent import (
+    GEOJSON_CACHE_DIR,
+    _ch1903p_to_wgs84,
+    _dedup_key,
+    _geojson_cache_path,
+    _iter_paragraphs,
+)
+
+
+class TestCH1903PConversion(unittest.TestCase):
+
+    def test_lv95_origin_is_bern(self):
+        """The LV95 projection origin (2600000/1200000) is the old Bern
+        observatory at ~7.4386°E, 46.9511°N."""
+        lon, lat = _ch1903p_to_wgs84(2600000.0, 1200000.0)
+        self.assertAlmostEqual(lon, 7.4386, places=3)
+        self.assertAlmostEqual(lat, 46.9511, places=3)
+
+    def test_offset_moves_in_the_right_direction(self):
+        lon_east, _ = _ch1903p_to_wgs84(2650000.0, 1200000.0)
+        _, lat_north = _ch1903p_to_wgs84(2600000.0, 1250000.0)
+        self.assertGreater(lon_east, 7.4386)
+        self.assertGreater(lat_north, 46.9511)
+
+
+class TestDedupKey(unittest.TestCase):
+
+    def test_whitespace_and_case_insensitive(self):
+        self.assertEqual(
+            _dedup_key('Figure 3: Geological  map\nof the area'),
+            _dedup_key('figure 3: geological map of the area'),
+        )
+
+    def test_different_texts_differ(self):
+        self.assertNotEqual(_dedup_key('Figure 3'), _dedup_key('Figure 4'))
+
+    def test_returns_fixed_size_digest(self):
+        key = _dedup_key('any text')
+        self.assertIsInstance(key, bytes)
+        self.assertEqual(len(key), 16)
+
+
+class TestIterParagraphs(unittest.TestCase):
+
+    def test_matches_split_without_empties(self):
+        text = 'first para\n\nsecond para\n\n\n\nthird para\n\n'
+        expected = [p for p in text.split('\n\n') if p]
+        self.assertEqual(list(_iter_paragraphs(text)), expected)
+
+    def test_empty_text(self):
+        self.assertEqual(list(_iter_paragraphs('')), [])
+
+    def test_single_paragraph(self):
+        self.assertEqual(list(_iter_paragraphs('only one')), ['only one'])
+
+
+class TestGeojsonCachePath(unittest.TestCase):
+
+    def test_deterministic_per_text(self):
+        self.assertEqual(_geojson_cache_path('full text'), _geojson_cache_path('full text'))
+        self.assertNotEqual(_geojson_cache_path('full text'), _geojson_cache_path('other text'))
+
+    def test_lives_under_the_cache_dir(self):
+        self.assertEqual(_geojson_cache_path('full text').parent, GEOJSON_CACHE_DIR)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,9 +8,40 @@ import os
 project_root = pathlib.Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(project_root / 'src'))
 
-from document_processing.pdf_processor import process_single_pdf
+from document_processing.pdf_processor import process_single_pdf, chunk_text_by_paragraph
 from models import Document
 
+
+class TestChunkTextByParagraph(unittest.TestCase):
+
+    SAMPLE_TEXT = (
+        "First paragraph that is definitely long enough to be kept as a chunk.\n\n"
+        "tiny\n\n"
+        "Second paragraph, also long enough to be kept,\nwith a wrapped line inside.\n\n"
+        "Third paragraph that is long enough to survive the minimum size filter."
+    )
+
+    def test_offsets_slice_back_to_kept_chunks(self):
+        """Each (start, end) offset must slice the original text back to its chunk."""
+        chunks, offsets = chunk_text_by_paragraph(self.SAMPLE_TEXT, with_offsets=True)
+
+        self.assertEqual(len(chunks), 3)  # the 'tiny' paragraph is filtered out
+        self.assertEqual(len(chunks), len(offsets))
+        for chunk, (start, end) in zip(chunks, offsets):
+            sliced = self.SAMPLE_TEXT[start:end].strip().replace('\n', ' ')
+            self.assertEqual(sliced, chunk)
+
+    def test_default_return_matches_offsets_variant(self):
+        """with_offsets must not change which chunks are returned."""
+        plain = chunk_text_by_paragraph(self.SAMPLE_TEXT)
+        with_offsets, _ = chunk_text_by_paragraph(self.SAMPLE_TEXT, with_offsets=True)
+        self.assertEqual(plain, with_offsets)
+
+    def test_empty_text(self):
+        self.assertEqual(chunk_text_by_paragraph(""), [])
+        self.assertEqual(chunk_text_by_paragraph("", with_offsets=True), ([], []))
+
+
 class TestPDFProcessor(unittest.TestCase):
 
     def setUp(self):